@@ -18,7 +18,6 @@
   Description:       Handles messages for RealStor enclosure requests
  ****************************************************************************
 """
-import json
 import time
 import socket
 
@@ -26,6 +25,7 @@ from actuators.impl.actuator import Actuator
 
 from framework.base.debug import Debug
 from framework.utils.service_logging import logger
+from framework.utils import json_utils
 from framework.utils.mon_utils import MonUtils
 from framework.platforms.realstor.realstor_enclosure import singleton_realstorencl
 from framework.base.sspl_constants import AlertTypes, SeverityTypes, ResourceTypes
@@ -225,7 +225,7 @@ class RealStorActuator(Actuator, Debug):
             return
 
         try:
-            jresponse = json.loads(response.content)
+            jresponse = json_utils.loads(response.content)
         except ValueError as badjson:
             logger.error("%s returned mal-formed json:\n%s" % (url, badjson))
 
@@ -263,7 +263,7 @@ class RealStorActuator(Actuator, Debug):
                     " {2}".format(self.rssencl.LDR_R1_ENCL, url, response.status_code))
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
 
         fan_modules_list = response_data["fan-modules"]
         fan_modules_list = self._get_fan_module_data(fan_modules_list, instance_id)
@@ -351,7 +351,7 @@ class RealStorActuator(Actuator, Debug):
                     " {2}".format(self.rssencl.LDR_R1_ENCL, url, response.status_code))
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
 
         controllers_list = response_data["controllers"]
         controllers_list = self._get_controller_data(controllers_list, instance_id)
@@ -434,7 +434,7 @@ class RealStorActuator(Actuator, Debug):
                         " err {2}".format(self.rssencl.LDR_R1_ENCL, url, response.status_code))
             return
         try:
-            jresponse = json.loads(response.content)
+            jresponse = json_utils.loads(response.content)
         except ValueError as badjson:
             logger.error("%s returned mal-formed json:\n%s" % (url, badjson))
         if jresponse:
@@ -470,7 +470,7 @@ class RealStorActuator(Actuator, Debug):
                         " err {2}".format(self.rssencl.LDR_R1_ENCL, url, response.status_code))
             return
         try:
-            jresponse = json.loads(response.text)
+            jresponse = json_utils.loads(response.content)
         except ValueError as badjson:
             logger.error("%s returned mal-formed json:\n%s" % (url, badjson))
         if jresponse:
@@ -556,7 +556,7 @@ class RealStorActuator(Actuator, Debug):
 
         json_response = None
         try:
-            json_response = json.loads(sas_response.content)
+            json_response = json_utils.loads(sas_response.content)
         except ValueError as v_error:
             logger.error("{0} returned invalid json:\n{1}".format(sasurl, v_error))
 
@@ -638,7 +638,7 @@ class RealStorActuator(Actuator, Debug):
             logger.error(f"Failed to get data for {uri}")
             return response
         try:
-            response = json.loads(response.content)
+            response = json_utils.loads(response.content)
             api_response = self.rssencl.get_api_status(response.get('status'))
             if api_response == 0 or \
                 (api_response == -1 and response.status_code == self.rssencl.ws.HTTP_OK):
@@ -20,6 +20,8 @@
                     another.
  ****************************************************************************
 """
+import logging
+
 from framework.utils.service_logging import logger
 
 class InternalMsgQ(object):
@@ -87,8 +89,11 @@ class InternalMsgQ(object):
 
     def _write_internal_msgQ(self, toModule, jsonMsg, event=None):
         """writes a json message to an internal message queue"""
-        self._log_debug("_write_internal_msgQ: From %s, To %s, Msg:%s" %
-                       (self.name(), toModule, jsonMsg))
+        # Formatting the whole msg is costly for large alerts,
+        # so only do it when debug logging is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_debug("_write_internal_msgQ: From %s, To %s, Msg:%s" %
+                           (self.name(), toModule, jsonMsg))
 
         q = self._msgQlist[toModule]
         q.put((jsonMsg, event))
@@ -20,12 +20,11 @@
 """
 
 import hashlib
-import json
 import time
 
 from framework.base import sspl_constants as sspl_const
 from framework.target.enclosure import StorageEnclosure
-from framework.utils import encryptor
+from framework.utils import encryptor, json_utils
 from framework.utils.conf_utils import (GLOBAL_CONF, MGMT_INTERFACE,
                                         POLLING_FREQUENCY, SSPL_CONF,
                                         STORAGE_ENCLOSURE, Conf,
@@ -230,7 +229,7 @@ class RealStorEnclosure(StorageEnclosure):
                 self.mc_timeout_counter = 0
 
                 try:
-                    jresponse = json.loads(response.content)
+                    jresponse = json_utils.loads(response.content)
 
                     #TODO: Need a way to check return-code 2 in more optimal way if possible,
                     # currently being checked for all http 200 responses
@@ -295,7 +294,7 @@ class RealStorEnclosure(StorageEnclosure):
             return
 
         try:
-            jresponse = json.loads(response.content)
+            jresponse = json_utils.loads(response.content)
         except ValueError as badjson:
             logger.error("%s returned mal-formed json:\n%s" % (url, badjson))
 
@@ -397,7 +396,7 @@ class RealStorEnclosure(StorageEnclosure):
         self.poll_system_ts = time.time()
 
         try:
-            jresponse = json.loads(response.content)
+            jresponse = json_utils.loads(response.content)
         except ValueError as badjson:
             logger.error("%s returned mal-formed json:\n%s" % (url, badjson))
 
@@ -484,7 +483,7 @@ class RealStorEnclosure(StorageEnclosure):
         if not response or response.status_code != self.ws.HTTP_OK:
             return []
         elif response or response.status_code == self.ws.HTTP_OK:
-            response_data = json.loads(response.text)
+            response_data = json_utils.loads(response.content)
             fru_data = response_data.get(fru)
 
         return fru_data
@@ -651,7 +650,7 @@ class RealStorEnclosure(StorageEnclosure):
                              " err {2}".format(self.EES_ENCL, url, response.status_code, fru))
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
         enclosure_wwn = response_data.get("enclosures")[0]["enclosure-wwn"]
         return enclosure_wwn
 
@@ -161,9 +161,10 @@ class Iem:
     def generate_iem(module, event_code, severity, description):
         """Generate iem and send it to a MessgaeBroker."""
 
-        IEM_msg = json.dumps(
-            {"iem": {"module": module, "event_code": event_code,
-                "severity": severity, "description": description}})
+        # IEM is serialized only when it has to be queued, a directly
+        # sent IEM is passed field by field to EventMessage.
+        IEM_msg = {"iem": {"module": module, "event_code": event_code,
+            "severity": severity, "description": description}}
         try:
             if Iem.iem_store_queue.is_empty():
                 logger.info(f"Sending IEM alert for module:{module}"
@@ -173,12 +174,13 @@ class Iem:
                 logger.info(
                     "'Accumulated iem queue' is not Empty."
                     " Adding IEM to the end of the queue")
-                Iem.iem_store_queue.put(IEM_msg)
+                Iem.iem_store_queue.put(json.dumps(IEM_msg))
         except (EventMessageError, Exception) as e:
+            iem_json = json.dumps(IEM_msg)
             logger.error(
                 f"Failed to send IEM alert. Error:{e}."
-                f" Adding IEM in accumulated queue. {IEM_msg}")
-            Iem.iem_store_queue.put(IEM_msg)
+                f" Adding IEM in accumulated queue. {iem_json}")
+            Iem.iem_store_queue.put(iem_json)
 
     @staticmethod
     def raise_iem_event(module, event_code, severity, description):
@@ -20,8 +20,7 @@ import shlex
 from framework.utils.ipmi import IPMI
 from framework.utils.service_logging import logger
 from cortx.utils.process import SimpleProcess
-from framework.utils.conf_utils import (Conf, SSPL_CONF, GLOBAL_CONF,
-                                        BMC_CHANNEL_IF, BMC_INTERFACE,
+from framework.utils.conf_utils import (Conf, GLOBAL_CONF,
                                         BMC_IP_KEY, BMC_USER_KEY,
                                         BMC_SECRET_KEY, MACHINE_ID,
                                         NODE_ID_KEY)
@@ -46,6 +45,10 @@ class IPMITool(IPMI):
     MANUFACTURER = "Manufacturer Name"
     ACTIVE_IPMI_TOOL = None
     VM_ERROR = 'Could not open device at'
+    COMMON_KEYS = frozenset({'Sensor ID', 'Entity ID'})
+    # Per-invocation setup cached across sub-commands
+    _simtool_active = None
+    _host_conf_cmd = None
 
     def __new__(cls):
         """new method"""
@@ -94,7 +97,7 @@ class IPMITool(IPMI):
             msg = "ipmitool sdr type command failed: {0}".format(error)
             logger.warning(msg)
             return
-        sensor_list = sensor_list_out.split("\n")
+        sensor_list = sensor_list_out.splitlines()
 
         out = []
         for sensor in sensor_list:
@@ -135,7 +138,7 @@ class IPMITool(IPMI):
             logger.warning(msg)
             err_response = {sensor_id: {"ERROR": msg}}
             return (False, err_response)
-        props_list = props_list_out.split("\n")
+        props_list = props_list_out.splitlines()
         props_list = props_list[1:] # The first line is 'Locating sensor record...'
 
         specific = {}
@@ -150,15 +153,11 @@ class IPMITool(IPMI):
                 specific[curr_key] += "\n" + prop
 
         common = {}
-        common_props = {
-            'Sensor ID',
-            'Entity ID',
-        }
-        # Whatever keys from common_props are present,
+        # Whatever keys from COMMON_KEYS are present,
         # move them to the 'common' dict
-        for c in (set(specific.keys()) & common_props):
-            common[c] = specific[c]
-            del specific[c]
+        for c in self.COMMON_KEYS:
+            if c in specific:
+                common[c] = specific.pop(c)
 
         return (common, specific)
 
@@ -174,29 +173,31 @@ class IPMITool(IPMI):
                 for fru in fru_detail}
         return sensor_id_map
 
-    def _run_ipmitool_subcommand(self, subcommand, grep_args=None):
-        """Executes ipmitool sub-commands, and optionally greps the output."""
-        self.ACTIVE_IPMI_TOOL = self.IPMITOOL
-        host_conf_cmd = ""
-
-        # Set ipmitool to ipmisimtool if activated.
-        if os.path.exists(f"{DATA_PATH}/server/activate_ipmisimtool"):
+    def _get_active_ipmi_tool(self):
+        """Returns ipmisimtool if the simulator is activated, else ipmitool.
+           Once the simulator responds, it is not probed again for as long
+           as it stays activated, rather than spawning an extra
+           'ipmisimtool sel info' for every sub-command. A failed probe is
+           not cached, so the simulator is picked up once it is available.
+        """
+        if not os.path.exists(f"{DATA_PATH}/server/activate_ipmisimtool"):
+            self._simtool_active = None
+            return self.IPMITOOL
+        if not self._simtool_active:
             cmd = self.IPMISIMTOOL + " sel info"
             _, _, retcode = SimpleProcess(cmd).run()
             if retcode in [0, 2]:
-                self.ACTIVE_IPMI_TOOL = self.IPMISIMTOOL
+                self._simtool_active = True
                 logger.info("IPMI simulator is activated.")
+        return self.IPMISIMTOOL if self._simtool_active else self.IPMITOOL
 
-        # Fetch channel info from config file and cache.
-        _channel_interface = Conf.get(SSPL_CONF, "%s>%s" %
-                                (BMC_INTERFACE, BMC_CHANNEL_IF))
-
-        _active_interface = store.get(BMCInterface.ACTIVE_BMC_IF.value, None)
-        if isinstance(_active_interface, bytes):
-            _active_interface = _active_interface.decode()
-        # Set host_conf_cmd based on channel info.
-        if (self.ACTIVE_IPMI_TOOL != self.IPMISIMTOOL and _active_interface
-                in BMCInterface.LAN_IF.value):
+    def _get_host_conf_cmd(self, active_interface):
+        """Returns the '-I <if> -H <ip> -U <user> -P <passwd>' arguments for
+           lan/lanplus interface. BMC secret is decrypted only once per
+           interface instead of on every sub-command.
+        """
+        if self._host_conf_cmd is None or \
+                self._host_conf_cmd[0] != active_interface:
             bmc_ip = Conf.get(GLOBAL_CONF, BMC_IP_KEY, '')
             bmc_user = Conf.get(GLOBAL_CONF, BMC_USER_KEY, 'ADMIN')
             bmc_secret = Conf.get(GLOBAL_CONF, BMC_SECRET_KEY, 'ADMIN')
@@ -206,8 +207,24 @@ class IPMITool(IPMI):
             bmc_pass = encryptor.decrypt(
                 decryption_key, bmc_secret, self.NAME)
 
-            host_conf_cmd = BMCInterface.LAN_CMD.value.format(
-                    _active_interface, bmc_ip, bmc_user, bmc_pass)
+            self._host_conf_cmd = (active_interface,
+                BMCInterface.LAN_CMD.value.format(
+                    active_interface, bmc_ip, bmc_user, bmc_pass))
+        return self._host_conf_cmd[1]
+
+    def _run_ipmitool_subcommand(self, subcommand, grep_args=None):
+        """Executes ipmitool sub-commands, and optionally greps the output."""
+        # Set ipmitool to ipmisimtool if activated.
+        self.ACTIVE_IPMI_TOOL = self._get_active_ipmi_tool()
+        host_conf_cmd = ""
+
+        _active_interface = store.get(BMCInterface.ACTIVE_BMC_IF.value, None)
+        if isinstance(_active_interface, bytes):
+            _active_interface = _active_interface.decode()
+        # Set host_conf_cmd based on channel info.
+        if (self.ACTIVE_IPMI_TOOL != self.IPMISIMTOOL and _active_interface
+                in BMCInterface.LAN_IF.value):
+            host_conf_cmd = self._get_host_conf_cmd(_active_interface)
 
         # generate the final cmd and execute on shell.
         command = " ".join([self.ACTIVE_IPMI_TOOL, host_conf_cmd, subcommand])
@@ -223,11 +240,8 @@ class IPMITool(IPMI):
 
         # Grep the output as per grep_args provided.
         if grep_args is not None and retcode == 0:
-            final_list = []
-            for l in out.split('\n'):
-                if re.search(grep_args, l) is not None:
-                    final_list += [l]
-            out = '\n'.join(final_list)
+            grep_re = re.compile(grep_args)
+            out = '\n'.join(l for l in out.splitlines() if grep_re.search(l))
 
         # Assign error_msg to err from output
         if retcode and not error:
@@ -260,7 +274,7 @@ class IPMITool(IPMI):
             logger.error("Failed in fetching FRU info from server."
                          f"Error:{err}")
         if output:
-            for line in output.split('\n'):
+            for line in output.splitlines():
                 self.fru_list.append(line.split(': ')[1])
             keywords = ['Pwr Supply', 'power', 'PS', 'PSU']
             fru_regex = re.compile("|".join(keywords))
@@ -0,0 +1,47 @@
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+"""
+ ****************************************************************************
+  Description:       JSON (de)serialization using orjson if available,
+                     falls back to python json module otherwise
+ ****************************************************************************
+"""
+
+import json
+
+try:
+    import orjson
+    use_orjson = True
+except ImportError:
+    use_orjson = False
+
+
+def dumps(obj):
+    """Serialize obj to a JSON formatted str."""
+    if use_orjson:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def loads(data):
+    """Deserialize a JSON document from str or UTF-8 bytes.
+
+    Passing bytes, e.g. response.content, avoids decoding them to str first.
+    Invalid documents raise json.JSONDecodeError with either backend.
+    """
+    if use_orjson:
+        return orjson.loads(data)
+    return json.loads(data)
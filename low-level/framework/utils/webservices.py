@@ -21,6 +21,8 @@
 """
 
 
+import threading
+
 import requests
 from requests.exceptions import Timeout, ConnectionError, HTTPError
 from framework.utils.service_logging import logger
@@ -49,15 +51,29 @@ class WebServices(object):
 
         self.http_methods = [self.HTTP_GET, self.HTTP_POST]
 
+        # requests.Session per calling thread, so that polls keep reusing
+        # the same keep-alive connection instead of reconnecting each time.
+        # Sessions are not shared as they are not safe across threads.
+        self._local = threading.local()
+
+    def _get_session(self):
+        """Returns the requests.Session of the calling thread"""
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            self._local.session = session
+        return session
+
     def ws_request(self, method, url, hdrs, postdata, tout):
         """Make webservice request"""
         wsresponse = None
 
         try:
+            session = self._get_session()
             if method == self.HTTP_GET:
-                wsresponse = requests.get(url, headers=hdrs, timeout=tout)
+                wsresponse = session.get(url, headers=hdrs, timeout=tout)
             elif method == self.HTTP_POST:
-                wsresponse = requests.post(url, headers=hdrs, data=postdata,
+                wsresponse = session.post(url, headers=hdrs, data=postdata,
                                timeout=tout)
 
             wsresponse.raise_for_status()
@@ -20,12 +20,15 @@
 """
 
 import calendar
-import json
+import functools
+import hashlib
+import mmap
 import os
 import re
+import shlex
 import subprocess
+import sys
 import time
-import uuid
 from collections import namedtuple
 from zope.interface import implementer
 
@@ -75,6 +78,24 @@ lan_cache_path = BMCInterface.LAN_IF_CACHE.value
 system_cache_path = BMCInterface.SYSTEM_IF_CACHE.value
 active_bmc_if_cache = BMCInterface.ACTIVE_BMC_IF.value
 
+# 'Fan #0x30' => ('Fan', '30')
+DEVICE_ID_RE = re.compile(r'(.*) (#0x([0-9a-f]+))?')
+# 'Sensor ID              : HDD 0 Status (0xf0)' => 'HDD 0 Status'
+SENSOR_ID_RE = re.compile(r'^Sensor ID\s*:\s*(.*?)(?:\s+\(0x[0-9a-fA-F]+\))?\s*$')
+# 'Sensor ID              : HDD 0 Status (0xf0)' => ('HDD 0 Status', 'f0')
+SDR_SENSOR_ID_RE = re.compile(r'^Sensor ID\s*:\s*(.*?)\s+\(0x([0-9a-fA-F]+)\)\s*$')
+# ' Sensor Type (Discrete): Drive Slot / Bay (0x0d)' => 'Drive Slot / Bay'
+# Event-only records have no '(Discrete)'/'(Threshold)' tag:
+# ' Sensor Type            : Power Unit (0x09)' => 'Power Unit'
+SDR_SENSOR_TYPE_RE = re.compile(
+    r'^\s*Sensor Type(?: \(\w+\))?\s*:\s*(.*?)\s+\(0x[0-9a-fA-F]+\)\s*$')
+# 'PS1 Status' => '1'
+DIGITS_RE = re.compile(r'\d+')
+# '65535 bytes' => '65535 '
+ALPHA_RE = re.compile(r'[A-Za-z]+')
+COMMA_SPACES_RE = re.compile(r',  +')
+BRACKETS_TABLE = str.maketrans('', '', '[]')
+
 
 @implementer(INodeHWsensor)
 class NodeHWsensor(SensorThread, InternalMsgQ):
@@ -88,13 +109,14 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
 
     sel_event_info = ""
 
-    TYPE_PSU_SUPPLY = 'Power Supply'
-    TYPE_PSU_UNIT = 'Power Unit'
-    TYPE_FAN = 'Fan'
-    TYPE_DISK = 'Drive Slot / Bay'
-    TYPE_TEMPERATURE = "Temperature"
-    TYPE_VOLTAGE = "Voltage"
-    TYPE_CURRENT = "Current"
+    # Interned, as SEL event device types are interned for faster lookups
+    TYPE_PSU_SUPPLY = sys.intern('Power Supply')
+    TYPE_PSU_UNIT = sys.intern('Power Unit')
+    TYPE_FAN = sys.intern('Fan')
+    TYPE_DISK = sys.intern('Drive Slot / Bay')
+    TYPE_TEMPERATURE = sys.intern("Temperature")
+    TYPE_VOLTAGE = sys.intern("Voltage")
+    TYPE_CURRENT = sys.intern("Current")
 
     fru_map = {
         "Drive Slot / Bay": "disk",
@@ -138,6 +160,10 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
     sdr_reset_required = False
     request_shutdown = False
     sel_last_queried = None
+    # Digest of the last collected SEL list, to skip unchanged SEL lists
+    sel_list_digest = None
+    # 'sel info' output collected during initialize, reused by first SEL check
+    initial_sel_info = None
     SEL_QUERY_FREQ = 300
 
     POLLING_INTERVAL = "polling_interval"
@@ -146,11 +172,65 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
     IPMITOOL = "sudo ipmitool "
     IPMISIMTOOL = "ipmisimtool "
 
-    DYNAMIC_KEYS = {
+    DYNAMIC_KEYS = frozenset({
             "Sensor Reading",
             "States Asserted",
+            })
+
+    COMMON_KEYS = frozenset({
+            "Sensor ID",
+            "Entity ID",
+            })
+
+    # FRU types whose handlers read sensor properties with 'sensor get'
+    SENSOR_GET_TYPES = {
+            TYPE_FAN,
+            TYPE_DISK,
+            TYPE_TEMPERATURE,
+            TYPE_VOLTAGE,
+            TYPE_CURRENT,
             }
 
+    # Multi-line sensor properties flattened by _clean_sensor_prop
+    MULTILINE_PROPS = (
+            'Deassertions Enabled',
+            'Assertions Enabled',
+            'Assertion Events',
+            'States Asserted',
+            )
+
+    # (event, status) => (alert_type, severity) for 'Power Unit' SEL events
+    PSU_UNIT_ALERTS = {
+        ("240VA power down", "Asserted"): ("fault", "critical"),
+        ("240VV power down", "Deasserted"): ("fault_resolved", "informational"),
+        ("AC lost", "Asserted"): ("fault", "critical"),
+        ("AC lost", "Deasserted"): ("fault_resolved", "informational"),
+        ("Failure detected", "Asserted"): ("fault", "critical"),
+        ("Failure detected", "Deasserted"): ("fault_resolved", "informational"),
+        ("Failure detected ()", "Asserted"): ("fault", "critical"),
+        ("Failure detected ()", "Deasserted"): ("fault_resolved", "informational"),
+        ("Power off/down", "Asserted"): ("fault", "critical"),
+        ("Power off/down", "Deasserted"): ("fault_resolved", "informational"),
+        ("Soft-power control failure", "Asserted"): ("fault", "warning"),
+        ("Soft-power control failure", "Deasserted"): ("fault_resolved", "informational"),
+        ("Fully Redundant", "Asserted"): ("fault_resolved", "informational"),
+        ("Fully Redundant", "Deasserted"): ("fault", "warning"),
+        ("Non-Redundant: Insufficient Resources", "Asserted"): ("fault", "critical"),
+        ("Non-Redundant: Insufficient Resources", "Deasserted"): ("fault_resolved", "informational"),
+        ("Non-Redundant: Sufficient from Insufficient", "Asserted"): ("fault", "warning"),
+        ("Non-Redundant: Sufficient from Insufficient", "Deasserted"): ("fault", "warning"),
+        ("Non-Redundant: Sufficient from Redundant", "Asserted"): ("fault", "warning"),
+        ("Non-Redundant: Sufficient from Redundant", "Deasserted"): ("fault", "informational"),
+        ("Redundancy Degraded", "Asserted"): ("fault", "warning"),
+        ("Redundancy Degraded", "Deasserted"): ("fault_resolved", "informational"),
+        ("Redundancy Degraded from Fully Redundant", "Asserted"): ("fault", "warning"),
+        ("Redundancy Degraded from Fully Redundant", "Deasserted"): ("fault_resolved", "warning"),
+        ("Redundancy Degraded from Non-Redundant", "Asserted"): ("fault", "critical"),
+        ("Redundancy Degraded from Non-Redundant", "Deasserted"): ("fault_resolved", "warning"),
+        ("Redundancy Lost", "Asserted"): ("fault", "warning"),
+        ("Redundancy Lost", "Deasserted"): ("fault_resolved", "informational"),
+    }
+
     # Dependency list
     DEPENDENCIES = {
                     "plugins": ["NodeDataMsgHandler"],
@@ -166,6 +246,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         super(NodeHWsensor, self).__init__(self.SENSOR_NAME.upper(), self.PRIORITY)
         self.os_utils = OSUtils()
         self.host_id = self.os_utils.get_fqdn()
+        self.severity_reader = SeverityReader()
 
         self.fru_types = {
             self.TYPE_FAN: self._parse_fan_info,
@@ -178,6 +259,12 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         }
         self.faulty_resources = {}
 
+        # Static part of the disk alert info
+        self._disk_info_template = None
+
+        # 'sensor get' output of the sensors referred by current SEL events
+        self._sensor_snapshot = {}
+
         # Flag to indicate suspension of module
         self._suspended = False
 
@@ -215,34 +302,38 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
 
         self.index_file_name = os.path.join(CACHE_DIR_NAME, self.INDEX_FILE)
 
-        bad_index_file = \
-                not os.path.exists(self.index_file_name) or \
-                os.path.getsize(self.index_file_name) == 0
-        if bad_index_file:
+        # This process is the only writer of the index file, so it is read
+        # only once here and the last index is kept in memory thereafter.
+        self.index_fd = os.open(self.index_file_name,
+            os.O_RDWR | os.O_CREAT | os.O_CLOEXEC, 0o666)
+        index_line = os.pread(self.index_fd, 32, 0).strip()
+        self.last_index = None
+        if index_line:
+            self.last_index = int(index_line, base=16)
+        else:
             self._write_index_file(0)
-        # Now self.index_file has a valid sel index in it
+        # Now self.last_index has a valid sel index in it
 
         self.list_file_name = os.path.join(CACHE_DIR_NAME, self.LIST_FILE)
         self.list_file = self._get_file(self.list_file_name)
+        # Size of the SEL list file, tracked to avoid a stat on every run
+        self.list_file_size = os.fstat(self.list_file.fileno()).st_size
 
         self.list_file_collect_name = os.path.join(CACHE_DIR_NAME, self.LIST_FILE_COLLECT)
 
     def _write_index_file(self, index):
         if not isinstance(index, int):
             index = int(index, base=16)
-        literal = "{0:x}\n".format(index)
+        if index == self.last_index:
+            return
+        literal = f"{index:x}\n".encode()
 
-        with self._get_file(self.index_file_name) as index_file :
-            index_file.seek(0)
-            index_file.truncate()
-            index_file.write(literal)
-            index_file.flush()
+        os.pwrite(self.index_fd, literal, 0)
+        os.ftruncate(self.index_fd, len(literal))
+        self.last_index = index
 
     def _read_index_file(self):
-        with self._get_file(self.index_file_name) as index_file :
-            index_file.seek(0)
-            index_line = index_file.readline().strip()
-            return int(index_line, base=16)
+        return self.last_index
 
     def initialize(self, conf_reader, msgQlist, products):
         """initialize configuration reader and internal msg queues"""
@@ -285,7 +376,9 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                 self.shutdown()
 
         # Set flag 'request_shutdown' to true if ipmitool/simulator is non-functional
-        _, _, retcode = self._run_ipmitool_subcommand("sel info")
+        sel_info, _, retcode = self._run_ipmitool_subcommand("sel info")
+        if retcode == 0:
+            self.initial_sel_info = sel_info
         if retcode != 0 and self.channel_err:
             if self._channel_interface == system:
                 log_msg = (
@@ -347,7 +440,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         command = None
         res, _, retcode = self._run_ipmitool_subcommand("channel info")
         if retcode == 0:
-            channel_info = res.strip().split("\n")
+            channel_info = res.strip().splitlines()
             # convert channel_info into dict
             channel_info = {k.strip():v.strip() for k,v in (x.split(":") for x in channel_info[1:]\
                             if ":" in x)}
@@ -364,29 +457,56 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                 self.get_channel_alert(ACTIVE_CHANNEL, self._channel_interface)
 
     def _update_list_file(self):
-        with open(self.list_file_collect_name, self.UPDATE_CREATE_MODE) as f:
-            # make sel list filter only for available frus. no extra data needed
-            # 'Power Supply|Power Unit|Fan|Drive Slot / Bay'
-            f.seek(0)
-            f.truncate()
-            available_fru = '|'.join(self.fru_types.keys())
-            _, err, retcode = self._run_ipmitool_subcommand(
-                    "sel list", grep_args=f"{available_fru}",
-                    out_file=f)
-            if retcode != 0:
-                msg = f"ipmitool sel list command failed: {err}"
-                logger.error(msg)
-                raise Exception(msg)
-
-        # os.rename() is required to be atomic on POSIX,
-        # (from here: https://docs.python.org/2/library/os.html#os.rename)
-        # which means that even if the current python process crashes
-        # the SEL list in the self.list_file_name file
-        # will always be in a consistent state.
-        os.rename(self.list_file_collect_name, self.list_file_name)
-
+        """Collect FRU events from SEL into the SEL list file.
+           Returns False if there is nothing new to notify."""
+        # make sel list filter only for available frus. no extra data needed
+        # 'Power Supply|Power Unit|Fan|Drive Slot / Bay'
+        available_fru = '|'.join(self.fru_types.keys())
+        sel_list, err, retcode = self._run_ipmitool_subcommand(
+                "sel list", grep_args=f"{available_fru}")
+        if retcode != 0:
+            msg = f"ipmitool sel list command failed: {err}"
+            logger.error(msg)
+            raise Exception(msg)
+
+        # write sel list only if there is no channel error
+        if self.channel_err:
+            sel_list = ""
+        sel_list_digest = hashlib.blake2b(
+            sel_list.encode(), digest_size=16).digest()
+
+        # Nothing to collect if the SEL has no FRU events or is unchanged
+        # since the last run and the SEL list file is already processed,
+        # skip rewriting, reopening and scanning it.
+        if self.list_file_size == 0 and \
+                (not sel_list or sel_list_digest == self.sel_list_digest):
+            return False
+
+        collect_fd = os.open(self.list_file_collect_name,
+            os.O_RDWR | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o666)
+        collect_file = os.fdopen(collect_fd, self.UPDATE_ONLY_MODE)
+        try:
+            collect_file.write(sel_list)
+            collect_file.flush()
+            list_file_size = os.fstat(collect_fd).st_size
+
+            # os.replace() is required to be atomic on POSIX,
+            # (from here: https://docs.python.org/3/library/os.html#os.replace)
+            # which means that even if the current python process crashes
+            # the SEL list in the self.list_file_name file
+            # will always be in a consistent state.
+            os.replace(self.list_file_collect_name, self.list_file_name)
+        except Exception:
+            collect_file.close()
+            raise
+
+        # The collect file descriptor now refers to the SEL list file,
+        # keep using it instead of opening the file again.
         self.list_file.close()
-        self.list_file = self._get_file(self.list_file_name)
+        self.list_file = collect_file
+        self.list_file_size = list_file_size
+        self.sel_list_digest = sel_list_digest
+        return True
 
     def _check_and_clear_sel(self):
         """ Clear SEL Table if SEL used memory seen above threshold
@@ -401,17 +521,22 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                 return
 
         try:
-            sel_info, err, retcode = self._run_ipmitool_subcommand("sel info")
-            if retcode != 0:
-                logger.error(f"ipmitool sel info command failed,  \
-                    with err {err}")
-                return (False)
+            if self.initial_sel_info is not None:
+                # SEL was just queried by initialize, no need to query again
+                sel_info, self.initial_sel_info = self.initial_sel_info, None
+            else:
+                sel_info, err, retcode = \
+                    self._run_ipmitool_subcommand("sel info")
+                if retcode != 0:
+                    logger.error(f"ipmitool sel info command failed,  \
+                        with err {err}")
+                    return (False)
 
             # record SEL last queried time
             self.sel_last_queried = time.time()
 
             key = val = None
-            info_list = sel_info.split("\n")
+            info_list = sel_info.splitlines()
 
             for info in info_list:
                 if ':' in info:
@@ -420,14 +545,14 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
 
             if self.SEL_INFO_PERC_USED in info_dict:
                 '''strip '%' or any unwanted char from value'''
-                info_dict[self.SEL_INFO_PERC_USED] = re.sub('%', '',
-                                          info_dict[self.SEL_INFO_PERC_USED])
+                info_dict[self.SEL_INFO_PERC_USED] = \
+                    info_dict[self.SEL_INFO_PERC_USED].replace('%', '')
 
                 if info_dict[self.SEL_INFO_PERC_USED].isdigit():
                    used = int(info_dict[self.SEL_INFO_PERC_USED])
                 else:
                     entries = int(info_dict[self.SEL_INFO_ENTRIES])
-                    free = int(re.sub('[A-Za-z]+','',\
+                    free = int(ALPHA_RE.sub('',
                                info_dict[self.SEL_INFO_FREESPACE]))
 
                     entries = entries * 16
@@ -453,11 +578,59 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             logger.exception(ae)
 
     def _read_sensor_list(self):
+        all_sensors = self._get_all_sensor_lists()
         self.sensor_id_map = dict()
         for fru in self.fru_types:
+            if all_sensors:
+                sensor_list = all_sensors.get(fru, [])
+            else:
+                sensor_list = self._get_sensor_list_by_type(fru)
             self.sensor_id_map[fru] = { sensor_num: sensor_id
-                for (sensor_id, sensor_num) in
-                self._get_sensor_list_by_type(fru)}
+                for (sensor_id, sensor_num) in sensor_list}
+
+    def _get_all_sensor_lists(self):
+        """get sensors of all types with a single verbose 'sdr elist'
+           instead of one 'sdr type' per FRU type.
+           Returns a dict of sensor type to list of tuples, of which
+           the first element is the sensor id and the second is the
+           number, or None if the SDR could not be listed this way."""
+
+        # ipmisimtool only supports 'sdr type'
+        if self.IPMISIMTOOL in (self.ipmi_client.ACTIVE_IPMI_TOOL or ""):
+            return None
+
+        # A failed dump just falls back to 'sdr type', so bypass the
+        # fault detection in self._run_ipmitool_subcommand.
+        sdr_out, _, retcode = \
+            self.ipmi_client._run_ipmitool_subcommand("-v sdr elist all")
+        if retcode != 0:
+            return None
+        return self._parse_verbose_sdr(sdr_out)
+
+    @classmethod
+    def _parse_verbose_sdr(cls, sdr_out):
+        """Parses verbose 'sdr elist' output into a dict of sensor type to
+           list of (sensor id, sensor number) tuples.
+           Returns None if the output reports an SDR error."""
+        # Example of a record from verbose 'sdr elist' command:
+        # Sensor ID              : HDD 0 Status (0xf0)
+        #  Entity ID             : 4.1 (Disk or Disk Bay)
+        #  Sensor Type (Discrete): Drive Slot / Bay (0x0d)
+        out = {}
+        sensor = None
+        for line in sdr_out.splitlines():
+            if cls.IPMI_SDR_ERR in line:
+                return None
+            match = SDR_SENSOR_ID_RE.match(line)
+            if match:
+                sensor_id, sensor_num = match.groups()
+                sensor = (sensor_id, f"{int(sensor_num, 16):02x}")
+                continue
+            match = SDR_SENSOR_TYPE_RE.match(line)
+            if match and sensor:
+                out.setdefault(match.group(1), []).append(sensor)
+                sensor = None
+        return out
 
     def run(self):
         """Run the sensor on its own thread"""
@@ -488,14 +661,14 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                 if self.channel_err is False:
                     # Check for a change in ipmi sel list and notify the node data
                     # msg handler
-                    if os.path.getsize(self.list_file_name) != 0:
+                    if self.list_file_size != 0:
                         # If the SEL list file is not empty, that means that some
                         # of the processing from the last iteration is incomplete.
                         # Complete that before getting the new SEL events.
                         self._notify_NodeDataMsgHandler()
 
-                    self._update_list_file()
-                    self._notify_NodeDataMsgHandler()
+                    if self._update_list_file():
+                        self._notify_NodeDataMsgHandler()
 
                     try:
                         self._check_faulty_resource_status()
@@ -528,8 +701,8 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             dynamic, static = self._get_sensor_sdr_props(sensor_id)
             if dynamic and 'States Asserted' in dynamic:
                 #  'States Asserted': 'Power Supply, Presence detected'
-                resource_state = re.sub(',  +', ', ', re.sub('[\[\]]','',
-                    dynamic['States Asserted']).replace('\n',','))
+                resource_state = self._clean_sensor_prop(
+                    dynamic['States Asserted'])
                 sensor_status = resource_state.split(',')
                 sensor_status = sensor_status[0] if len(sensor_status) == 1 \
                     else sensor_status[1]
@@ -573,29 +746,28 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
     def _get_sel_event(self):
         last_index = self._read_index_file()
 
-        # TODO: See if the following 2 loops can be reduced to
-        # a single loop using mmap() and a fixed file format like
-        # the one produced by the 'ipmitool sel file' or
-        # 'ipmitool sel writeraw' commands.
-        found = False
-        self.list_file.seek(0, os.SEEK_SET)
-        for line in self.list_file:
-            if not found:
-                if line.split("|")[0].strip() == "{0:x}".format(last_index):
-                    found = True
-                continue
+        if self.list_file_size == 0:
+            return
+        list_fd = self.list_file.fileno()
+
+        # Search the SEL list for the last processed index in a single
+        # scan instead of splitting every line of it, and only decode
+        # the new events which follow it.
+        last_index_re = re.compile(rb"^[ \t]*%x[ \t]*\|" % last_index, re.M)
+        with mmap.mmap(list_fd, 0, access=mmap.ACCESS_READ) as sel_list:
+            found = last_index_re.search(sel_list)
+            if found:
+                next_line = sel_list.find(b"\n", found.end()) + 1
+                new_events = sel_list[next_line:] if next_line else b""
+            else:
+                # This can mean one of a few things:
+                # 1. The SEL has been cleared beyond the last index we saw
+                # 2. It has rotated to beyond the last index we saw
+                new_events = sel_list[:]
 
+        for line in new_events.decode().splitlines():
             yield self._make_sel_event(line)
 
-        if not found:
-            # This can mean one of a few things:
-            # 1. The SEL has been cleared beyond the last index we saw
-            # 2. It has rotated to beyond the last index we saw
-            # 3. self.list_file is empty
-            self.list_file.seek(0, os.SEEK_SET)
-            for line in self.list_file:
-                yield self._make_sel_event(line)
-
     def _make_sel_event(self, sel_line):
         # Separate out the components of the sel event
         # Sample sel event which gets parsed
@@ -603,14 +775,14 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         index, date, _time, device_id, event, status = [
             attr.strip() for attr in sel_line.split("|") ]
         device_type, sensor_num = NodeHWsensor._get_device_type_num(device_id)
+        device_type = sys.intern(device_type)
 
         return (index, date, _time, device_id, device_type, sensor_num, event, status)
 
     @staticmethod
     def _get_device_type_num(device_id):
         try:
-            device_type, sensor_num = re.match(
-                    '(.*) (#0x([0-9a-f]+))?', device_id).group(1, 3)
+            device_type, sensor_num = DEVICE_ID_RE.match(device_id).group(1, 3)
         except:
             # If device_type and sensor_num is not found in device_id
             device_type = device_id
@@ -618,19 +790,44 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
 
         return device_type, sensor_num
 
+    @staticmethod
+    def _clean_sensor_prop(value):
+        """Flattens a multi-line sensor property into a single line
+           'Power Supply\n   [Presence detected]' => 'Power Supply, Presence detected'
+           in a single pass of precompiled substitutions.
+        """
+        return COMMA_SPACES_RE.sub(', ',
+            value.translate(BRACKETS_TABLE).replace('\n', ','))
+
     def _notify_NodeDataMsgHandler(self):
         """See if there is any new event gets generated in the sel and notify
             node data message handler for generating JSON message"""
 
+        # Read the SEL list once, then find the last event per device type
+        sel_events = list(self._get_sel_event())
         last_fru_index = {}
         last_index = None
+        sensor_names = set()
         for (index, date, event_time, device_id, device_type, sensor_num, event, status) \
-                in self._get_sel_event():
+                in sel_events:
             last_fru_index[device_type] = index
             last_index = index
+            if device_type in self.SENSOR_GET_TYPES:
+                sensor_name = self.sensor_id_map.get(
+                    device_type, {}).get(sensor_num)
+                if sensor_name:
+                    sensor_names.add(sensor_name)
+
+        try:
+            self._take_sensor_snapshot(sensor_names)
+        except Exception as e:
+            # Not fatal, the handlers fetch sensor props one by one instead
+            logger.error(f"_notify_NodeDataMsgHandler, error {e} while taking "
+                         "sensor snapshot, falling back to per sensor 'sensor get'")
+            self._sensor_snapshot = {}
 
         for (index, date, event_time, device_id, device_type, sensor_num, event, status) \
-                in self._get_sel_event():
+                in sel_events:
 
             is_last = (last_fru_index[device_type] == index)
             logger.debug(f"_notify_NodeDataMsgHandler '{device_type}': is_last: \
@@ -638,9 +835,10 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             # TODO: Also use information from the command
             # 'ipmitool sel get <sel-entry-id>'
             # which gives more detailed information
-            if device_type in self.fru_types:
+            handler = self.fru_types.get(device_type)
+            if handler is not None:
                 try:
-                    self.fru_types[device_type](index, date, event_time, device_id,
+                    handler(index, date, event_time, device_id,
                             sensor_num, event, status, is_last)
                 except KeyError:
                     logger.warn(f"Sensor {sensor_num} for {device_type} is not present, ignoring event")
@@ -648,18 +846,69 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                     logger.error(f"_notify_NodeDataMsgHandler, error {e} while processing \
                         sel_event: {(index, date, event_time, device_id, device_type, sensor_num, event, status)}, ignoring event")
 
+        # Dynamic readings must be fetched afresh for next SEL events
+        self._sensor_snapshot = {}
+
         if last_index is not None:
             self._write_index_file(last_index)
         self.list_file.seek(0)
         self.list_file.truncate()
+        self.list_file_size = 0
+
+    def _take_sensor_snapshot(self, sensor_names):
+        """Fetch properties of all the given sensors with a single
+           'ipmitool sensor get <id> [<id> ...]' instead of one call per
+           SEL event. Sensors not found in the snapshot are fetched
+           individually by _get_sensor_props."""
+        self._sensor_snapshot = {}
+        # Batching pays off only for more than one sensor, and
+        # ipmisimtool supports a single sensor id per 'sensor get'.
+        if len(sensor_names) < 2 or \
+                self.IPMISIMTOOL in (self.ipmi_client.ACTIVE_IPMI_TOOL or ""):
+            return
+
+        sensors = " ".join(f"'{name}'" for name in sensor_names)
+        # Bypass the fault detection in self._run_ipmitool_subcommand,
+        # a failed batch just falls back to per sensor 'sensor get'.
+        props_list_out, _, retcode = \
+            self.ipmi_client._run_ipmitool_subcommand(f"sensor get {sensors}")
+        if retcode != 0:
+            return
+
+        self._sensor_snapshot = self._split_sensor_blocks(props_list_out)
 
-    def _run_command(self, command, out_file=subprocess.PIPE):
-        """executes commands"""
-        process = subprocess.Popen(command, shell=True, stdout=out_file, stderr=subprocess.PIPE)
+    @staticmethod
+    def _split_sensor_blocks(output):
+        """Splits 'sensor get' output listing several sensors into
+           {sensor id: lines of its block}. Each sensor block starts with
+           'Sensor ID' and ends with an empty line."""
+        blocks = {}
+        props_list = None
+        for prop in output.splitlines():
+            match = SENSOR_ID_RE.match(prop)
+            if match:
+                props_list = []
+                blocks[match.group(1)] = props_list
+            elif prop == '':
+                props_list = None
+            if props_list is not None:
+                props_list.append(prop)
+        return blocks
+
+    def _run_command(self, command):
+        """executes commands without an intermediate shell"""
+        if isinstance(command, str):
+            command = shlex.split(command)
+        try:
+            process = subprocess.Popen(command, stdout=subprocess.PIPE,
+                                       stderr=subprocess.PIPE)
+        except OSError as err:
+            # Same as the exit code of a shell failing to find the command
+            return (None, str(err).encode()), BASH_ILLEGAL_CMD
         result = process.communicate()
         return result, process.returncode
 
-    def _run_ipmitool_subcommand(self, subcommand, grep_args=None, out_file=subprocess.PIPE):
+    def _run_ipmitool_subcommand(self, subcommand, grep_args=None):
         """executes ipmitool sub-commands, and optionally greps the output"""
 
         res, err, retcode = \
@@ -695,11 +944,6 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             self.iem.iem_fault_resolved("IPMITOOL_AVAILABLE")
             self.iem.fault_iems.remove(self.IPMI)
 
-        # write res to out_file only if there is no channel error
-        if not self.channel_err and res:
-            if out_file != subprocess.PIPE:
-                out_file.write(res)
-
         return res, err, retcode
 
     def _check_channel_error(self, err, retcode):
@@ -753,7 +997,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         """create BMC interface alert json msg."""
         specific_info = {}
         alert_type = alert.alert
-        severity = SeverityReader().map_severity(alert_type)
+        severity = self.severity_reader.map_severity(alert_type)
         channel_info = self.CHANNEL_INFO
 
         if IF_name in BMCInterface.LAN_IF.value:
@@ -792,26 +1036,23 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         return self.sel_event_info
 
     def _get_sensor_list_by_type(self, sensor_type):
-        """get list of sensors of type 'sensor_type'
-           Returns a list of tuples, of which
+        """get sensors of type 'sensor_type'
+           Yields tuples, of which
            the first element is the sensor id and
            the second is the number."""
 
         sensor_list_out, err, retcode = \
             self._run_ipmitool_subcommand(f"sdr type '{sensor_type}'")
-        out = []
 
         if retcode != 0:
             msg = f"ipmitool sdr type command failed: {err}"
             logger.warning(msg)
-            return out
-
-        sensor_list = sensor_list_out.split("\n")
+            return
 
-        for sensor in sensor_list:
+        for sensor in sensor_list_out.splitlines():
             if self.IPMI_SDR_ERR in sensor:
                 self.sdr_reset_required = True
-                return out
+                return
             if sensor == "":
                 break
             # Example of output form 'sdr type' command:
@@ -822,12 +1063,11 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             sensor_id, sensor_num, status, entity_id, reading  = fields_list
             sensor_num = sensor_num.strip("h").lower()
 
-            out.append((sensor_id, sensor_num))
-        return out
+            yield (sensor_id, sensor_num)
 
     def _get_sensor_list_by_entity(self, entity_id):
-        """get list of sensors belonging to entity 'entity_id'
-           Returns a list of sensor IDs"""
+        """get sensors belonging to entity 'entity_id'
+           Yields sensor IDs"""
 
         sensor_list_out, err, retcode = \
             self._run_ipmitool_subcommand(f"sdr entity '{entity_id}'")
@@ -835,12 +1075,10 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             msg = f"ipmitool sdr entity command failed: {err}"
             logger.error(msg)
             return
-        sensor_list = sensor_list_out.split("\n")
 
-        out = []
-        for sensor in sensor_list:
+        for sensor in sensor_list_out.splitlines():
             if self.IPMI_SDR_ERR in sensor:
-                return out
+                return
             if sensor == '':
                 continue
             # Output from 'sdr entity' command is same as from 'sdr type' command.
@@ -848,8 +1086,26 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             sensor_id, sensor_num, status, entity_id, reading = fields_list
             sensor_num = sensor_num.strip("h").lower()
 
-            out.append(sensor_id)
-        return out
+            yield sensor_id
+
+    def _parse_sensor_props(self, props_list):
+        """Parses 'key : value' lines of 'sdr get' and 'sensor get' output
+           into a dict. Lines without a key, like '[Drive Present]', are
+           continuation of the previous key's value."""
+        props = {}
+        curr_key = None
+        for prop in props_list:
+            if self.IPMI_SDR_ERR in prop:
+                break
+            if prop == '':
+                continue
+            key, sep, val = prop.partition(':')
+            if sep and '[' not in prop and ']' not in prop:
+                curr_key = key.strip()
+                props[curr_key] = val.strip()
+            else:
+                props[curr_key] += "\n" + prop
+        return props
 
     def _get_sensor_sdr_props(self, sensor_id):
         props_list_out, err, retcode = \
@@ -858,31 +1114,14 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             msg = f"ipmitool sensor get command failed: {err}"
             logger.warning(msg)
             return
-        props_list = props_list_out.split("\n")
-
-        static_keys = {}
+        static_keys = self._parse_sensor_props(props_list_out.splitlines())
         dynamic = {}
-        curr_key = None
-        for prop in props_list:
-            if self.IPMI_SDR_ERR in prop:
-                return (dynamic, static_keys)
-            if prop == '':
-                continue
-            if ':' in prop and '[' not in prop and ']' not in prop:
-                curr_key, val = [f.strip() for f in prop.split(":")]
-                static_keys[curr_key] = val
-            else:
-                static_keys[curr_key] += "\n" + prop
 
-        common_props = {
-            'Sensor ID',
-            'Entity ID',
-        }
         # Whatever keys from DYNAMIC_KEYS are present,
         # move them to the 'dynamic' dict
-        for c in (set(static_keys.keys()) & self.DYNAMIC_KEYS):
-            dynamic[c] = static_keys[c]
-            del static_keys[c]
+        for c in self.DYNAMIC_KEYS:
+            if c in static_keys:
+                dynamic[c] = static_keys.pop(c)
 
         return (dynamic, static_keys)
 
@@ -892,43 +1131,30 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
            common is a dict of common sensor properties and
            their values for this sensor, and
            specific is a dict of the properties specific to this sensor"""
-        props_list_out, err, retcode = \
-            self._run_ipmitool_subcommand(f"sensor get '{sensor_id}'")
-        if retcode != 0:
-            msg = f"ipmitool sensor get command failed: {err}"
-            logger.warning(msg)
-            return (False, False, False)
-        props_list = props_list_out.split('\n')
-        props_list = props_list[1:] # The first line is 'Locating sensor record...'
+        props_list = self._sensor_snapshot.get(sensor_id)
+        if props_list is None:
+            props_list_out, err, retcode = \
+                self._run_ipmitool_subcommand(f"sensor get '{sensor_id}'")
+            if retcode != 0:
+                msg = f"ipmitool sensor get command failed: {err}"
+                logger.warning(msg)
+                return (False, False, False)
+            props_list = props_list_out.splitlines()
+            props_list = props_list[1:] # The first line is 'Locating sensor record...'
 
-        specific_static = {}
+        specific_static = self._parse_sensor_props(props_list)
         common = {}
         specific_dynamic = {}
-        curr_key = None
-        for prop in props_list:
-            if self.IPMI_SDR_ERR in prop:
-                return (common, specific_static, specific_dynamic)
-            if prop == '':
-                continue
-            if ':' in prop:
-                curr_key, val = [f.strip() for f in prop.split(":")]
-                specific_static[curr_key] = val
-            else:
-                specific_static[curr_key] += "\n" + prop
 
-        common_props = {
-            'Sensor ID',
-            'Entity ID',
-        }
-        # Whatever keys from common_props are present,
+        # Whatever keys from COMMON_KEYS are present,
         # move them to the 'common' dict
-        for c in (set(specific_static.keys()) & common_props):
-            common[c] = specific_static[c]
-            del specific_static[c]
+        for c in self.COMMON_KEYS:
+            if c in specific_static:
+                common[c] = specific_static.pop(c)
 
-        for c in (set(specific_static.keys()) & self.DYNAMIC_KEYS):
-            specific_dynamic[c] = specific_static[c]
-            del specific_static[c]
+        for c in self.DYNAMIC_KEYS:
+            if c in specific_static:
+                specific_dynamic[c] = specific_static.pop(c)
 
         return (common, specific_static, specific_dynamic)
 
@@ -982,7 +1208,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                 del fan_specific_data[key]
 
         fan_info = fan_specific_data
-        fan_info.update({"fru_id" : device_id, "event" : status + " - " + event})
+        fan_info.update({"fru_id" : device_id, "event" : f"{status} - {event}"})
         resource_type = NodeDataMsgHandler.IPMI_RESOURCE_TYPE_FAN
         fru = self.ipmi_client.is_fru(self.fru_map[self.TYPE_FAN])
 
@@ -1015,7 +1241,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         """Parse out PSU related changes that gets reflected in the ipmi sel list"""
         sensor_id = self.sensor_id_map[self.TYPE_PSU_SUPPLY][sensor_num]
         # eg. sensor_id "PS1 Status", "Pwr Supply 1"
-        port_num = re.search(r'\d+', sensor_id)
+        port_num = DIGITS_RE.search(sensor_id)
         # TODO: Handle the case => port_num can't be extracted on Dell servers.
         #       since Sensor_id is just `Status` without any numerical id,
         #       unlike 'PS1 Status'/'Power Supply 1' present on other servers.
@@ -1051,13 +1277,10 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         specific_info.update(static)
 
         # Remove unnecessary characters props
-        for key in ['Deassertions Enabled', 'Assertions Enabled',
-                    'States Asserted', 'Assertion Events']:
-            try:
-                specific_info[key] = re.sub(',  +', ', ', re.sub('[\[\]]','', \
-                    specific_info[key]).replace('\n',','))
-            except KeyError:
-                pass
+        for key in self.MULTILINE_PROPS:
+            value = specific_info.get(key)
+            if value is not None:
+                specific_info[key] = self._clean_sensor_prop(value)
 
         if is_last:
             specific_info.update(dynamic)
@@ -1080,39 +1303,6 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
     def _parse_psu_unit_info(self, index, date, _time, sensor, sensor_num, event, status, is_last):
         """Parse out PSU related changes that gets reflected in the ipmi sel list"""
 
-        alerts = {
-
-            ("240VA power down", "Asserted"): ("fault", "critical"),
-            ("240VV power down", "Deasserted"): ("fault_resolved", "informational"),
-            ("AC lost", "Asserted"): ("fault", "critical"),
-            ("AC lost", "Deasserted"): ("fault_resolved", "informational"),
-            ("Failure detected", "Asserted"): ("fault", "critical"),
-            ("Failure detected", "Deasserted"): ("fault_resolved", "informational"),
-            ("Failure detected ()", "Asserted"): ("fault", "critical"),
-            ("Failure detected ()", "Deasserted"): ("fault_resolved", "informational"),
-            ("Power off/down", "Asserted"): ("fault", "critical"),
-            ("Power off/down", "Deasserted"): ("fault_resolved", "informational"),
-            ("Soft-power control failure", "Asserted"): ("fault", "warning"),
-            ("Soft-power control failure", "Deasserted"): ("fault_resolved", "informational"),
-            ("Fully Redundant", "Asserted"): ("fault_resolved", "informational"),
-            ("Fully Redundant", "Deasserted"): ("fault", "warning"),
-            ("Non-Redundant: Insufficient Resources", "Asserted"): ("fault", "critical"),
-            ("Non-Redundant: Insufficient Resources", "Deasserted"): ("fault_resolved", "informational"),
-            ("Non-Redundant: Sufficient from Insufficient", "Asserted"): ("fault", "warning"),
-            ("Non-Redundant: Sufficient from Insufficient", "Deasserted"): ("fault", "warning"),
-            ("Non-Redundant: Sufficient from Redundant", "Asserted"): ("fault", "warning"),
-            ("Non-Redundant: Sufficient from Redundant", "Deasserted"): ("fault", "informational"),
-            ("Redundancy Degraded", "Asserted"): ("fault", "warning"),
-            ("Redundancy Degraded", "Deasserted"): ("fault_resolved", "informational"),
-            ("Redundancy Degraded from Fully Redundant", "Asserted"): ("fault", "warning"),
-            ("Redundancy Degraded from Fully Redundant", "Deasserted"): ("fault_resolved", "warning"),
-            ("Redundancy Degraded from Non-Redundant", "Asserted"): ("fault", "critical"),
-            ("Redundancy Degraded from Non-Redundant", "Deasserted"): ("fault_resolved", "warning"),
-            ("Redundancy Lost", "Asserted"): ("fault", "warning"),
-            ("Redundancy Lost", "Deasserted"): ("fault_resolved", "informational"),
-
-        }
-
         sensor_id = self.sensor_id_map[self.TYPE_PSU_UNIT][sensor_num]
         resource_type = NodeDataMsgHandler.IPMI_RESOURCE_TYPE_PSU
         fru = self.ipmi_client.is_fru(self.fru_map[self.TYPE_PSU_UNIT])
@@ -1125,7 +1315,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         }
 
         try:
-            (alert_type, severity) = alerts[(event, status)]
+            (alert_type, severity) = self.PSU_UNIT_ALERTS[(event, status)]
         except KeyError:
             logger.error(f"Unknown event: {event}, status: {status}")
             return
@@ -1136,13 +1326,10 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
 
         specific_info.update(static)
 
-        for key in ['Deassertions Enabled', 'Assertions Enabled',
-                    'Assertion Events', 'States Asserted']:
-            try:
-                specific_info[key] = re.sub(',  +', ', ', re.sub('[\[\]]','', \
-                    specific_info[key]).replace('\n',','))
-            except KeyError:
-                pass
+        for key in self.MULTILINE_PROPS:
+            value = specific_info.get(key)
+            if value is not None:
+                specific_info[key] = self._clean_sensor_prop(value)
 
         if is_last:
             specific_info.update(dynamic)
@@ -1165,7 +1352,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
 
         sensor_id = self.sensor_id_map[self.TYPE_DISK][sensor_num]
         # eg. sensor_id => "HDD 0 Status"
-        disk_slot = re.search(r'\d+', sensor_id)  # eg. disk_slot => "0"
+        disk_slot = DIGITS_RE.search(sensor_id)  # eg. disk_slot => "0"
         if disk_slot:
             disk_slot = disk_slot.group()
         if 'Status' in sensor_id:
@@ -1188,27 +1375,27 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
             except Exception as e:
                 logger.exception(e)
                 return
-            info = {
-                "resource_type": resource_type,
-                "fru": self.ipmi_client.is_fru(self.fru_map[self.TYPE_DISK]),
-                "resource_id": disk_name,
-                "event_time": self._get_epoch_time_from_date_and_time(date, _time),
-                "description": alert.description.format(disk_slot, disk_name),
-                "impact": alert.impact,
-                "recommendation": alert.recommendation
-            }
+            if self._disk_info_template is None:
+                # Built on the first disk event, once the FRU list is known
+                self._disk_info_template = {
+                    "resource_type": resource_type,
+                    "fru": self.ipmi_client.is_fru(self.fru_map[self.TYPE_DISK])
+                }
+            info = self._disk_info_template.copy()
+            info["resource_id"] = disk_name
+            info["event_time"] = self._get_epoch_time_from_date_and_time(date, _time)
+            info["description"] = alert.description.format(disk_slot, disk_name)
+            info["impact"] = alert.impact
+            info["recommendation"] = alert.recommendation
             specific_info["fru_id"] = disk_name
 
             if is_last:
                 specific_info.update(specific_dynamic)
 
-            for key in ['Deassertions Enabled', 'Assertions Enabled',
-                        'Assertion Events', 'States Asserted']:
-                try:
-                    specific_info[key] = re.sub(',  +', ', ', re.sub('[\[\]]','', \
-                        specific_info[key]).replace('\n',','))
-                except KeyError:
-                    pass
+            for key in self.MULTILINE_PROPS:
+                value = specific_info.get(key)
+                if value is not None:
+                    specific_info[key] = self._clean_sensor_prop(value)
 
             if alert.type in ["fault", "missing"]:
                 self.faulty_resources[sensor_id] = {
@@ -1234,8 +1421,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         if threshold.lower() in ['low', 'high']:
             alert_type = f"threshold_breached:{threshold}"
         if alert_type:
-            severity_reader = SeverityReader()
-            severity = severity_reader.map_severity(alert_type)
+            severity = self.severity_reader.map_severity(alert_type)
             if threshold.lower() in ['low', 'high'] and status.lower() == "deasserted":
                 severity = "informational"
         else:
@@ -1283,8 +1469,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         if threshold.lower() in ['low', 'high']:
             alert_type = f"threshold_breached:{threshold}"
         if alert_type:
-            severity_reader = SeverityReader()
-            severity = severity_reader.map_severity(alert_type)
+            severity = self.severity_reader.map_severity(alert_type)
             if threshold.lower() in ['low', 'high'] and status.lower() == "deasserted":
                 severity = "informational"
         else:
@@ -1331,8 +1516,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         if threshold.lower() in ['low', 'high']:
             alert_type = f"threshold_breached:{threshold}"
         if alert_type:
-            severity_reader = SeverityReader()
-            severity = severity_reader.map_severity(alert_type)
+            severity = self.severity_reader.map_severity(alert_type)
             if (
                 threshold.lower() in ['low', 'high'] and
                     status.lower() == "deasserted"):
@@ -1376,7 +1560,11 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         """Transmit data to NodeDataMsgHandler which takes two arguments.
            device will be device name and data will consist of relevant data"""
 
-        internal_json_msg = json.dumps({
+        # The msg stays within this process, so it is queued as a dict,
+        # which NodeDataMsgHandler accepts as is. Serializing it here
+        # would only have it parsed back by the handler. info and
+        # specific_info are built per event and not touched after this.
+        internal_json_msg = {
             "sensor_request_type" : {
                 "node_data":{
                     "alert_type": alert_type,
@@ -1387,7 +1575,7 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
                     "specific_info": specific_info
                 }
             }
-          })
+          }
 
         # Send the event to node data message handler to generate json message and send out
         self._write_internal_msgQ(NodeDataMsgHandler.name(), internal_json_msg)
@@ -1396,14 +1584,18 @@ class NodeHWsensor(SensorThread, InternalMsgQ):
         """Returns alert id which is a combination of
            epoch_time and salt value
         """
-        salt = str(uuid.uuid4().hex)
-        alert_id = epoch_time + salt
-        return alert_id
-
-    def _get_epoch_time_from_date_and_time(self, _date, _time):
-        timestamp_format = '%m/%d/%Y %H:%M:%S'
-        timestamp = time.strptime('{} {}'.format(_date,_time), timestamp_format)
-        return str(int(calendar.timegm(timestamp)))
+        return f"{epoch_time}{os.urandom(16).hex()}"
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _get_epoch_time_from_date_and_time(_date, _time):
+        # Cached, as SEL events in a burst mostly share the same timestamps.
+        # ipmitool prints a fixed '%m/%d/%Y %H:%M:%S' layout, so split it
+        # directly instead of going through time.strptime.
+        month, day, year = _date.split('/')
+        hour, minute, second = _time.split(':')
+        return str(calendar.timegm((int(year), int(month), int(day),
+                                    int(hour), int(minute), int(second))))
 
     def suspend(self):
         """Suspends the module thread. It should be non-blocking"""
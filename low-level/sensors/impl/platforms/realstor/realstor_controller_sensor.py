@@ -18,10 +18,9 @@
   Description:       Monitors Controller data using RealStor API.
  ****************************************************************************
 """
-import json
+import copy
 import os
 import time
-import uuid
 from threading import Event
 
 from zope.interface import implementer
@@ -36,6 +35,7 @@ from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
 from framework.utils.os_utils import OSUtils
+from framework.utils import json_utils
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.Icontroller import IControllersensor
@@ -85,9 +85,15 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
         # controllers persistent cache
         self._controller_prcache = None
 
+        # Static part of the alert info, built with the first alert
+        self._info_template = None
+
         # Holds Controllers with faults. Used for future reference.
         self._previously_faulty_controllers = {}
 
+        # Copy of the faulty Controller data last written to the store
+        self._persisted_faulty_controllers = None
+
         self.pollfreq_controllersensor = \
             int(Conf.get(SSPL_CONF,f"{self.rssencl.CONF_REALSTORCONTROLLERSENSOR}>{POLLING_FREQUENCY_OVERRIDE}",
                                 0))
@@ -98,8 +104,10 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
         # Flag to indicate suspension of module
         self._suspended = False
 
-        self._event = Event()
         self.os_utils = OSUtils()
+        self.severity_reader = SeverityReader()
+        # Resolved once, get_fqdn may block on a reverse DNS lookup
+        self.host_name = self.os_utils.get_fqdn()
 
     def initialize(self, conf_reader, msgQlist, products):
         """initialize configuration reader and internal msg queues"""
@@ -125,6 +133,8 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
             self._previously_faulty_controllers = {}
             store.put(self._previously_faulty_controllers,\
                 self._faulty_controller_file_path)
+        self._persisted_faulty_controllers = \
+            copy.deepcopy(self._previously_faulty_controllers)
 
         return True
 
@@ -180,7 +190,7 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
                      err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
         controllers = response_data.get("controllers")
         return controllers
 
@@ -196,9 +206,13 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
         # Flag to indicate if there is a change in _previously_faulty_controllers
         state_changed = False
         prev_alert_type = None
+        # Events of the msgs sent in this poll, per Controller
+        sent_events = {}
 
         if not controllers:
             return
+        # All alerts raised by one poll share its timestamp
+        epoch_time = str(int(time.time()))
         for controller in controllers:
             controller_health = controller["health"].lower()
             controller_status = controller["status"].lower()
@@ -218,11 +232,12 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
                         "health": controller_health, "alert_type": alert_type}
                     state_changed = True
                     internal_json_msg = self._create_internal_msg(
-                        controller, alert_type)
+                        controller, alert_type, epoch_time)
                     faulty_controller_messages.append(internal_json_msg)
                     # Send message to handler
                     if send_message:
-                        self._send_json_msg(internal_json_msg)
+                        sent_events.setdefault(durable_id, []).append(
+                            self._send_json_msg(internal_json_msg))
             # Check for fault case
             elif controller_health == self.rssencl.HEALTH_DEGRADED:
                 # Status change from Fault ==> Degraded or OK ==> Degraded
@@ -240,25 +255,28 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
                         alert_type = self.rssencl.FRU_INSERTION
 
                         internal_json_msg = self._create_internal_msg(
-                                    controller, alert_type)
+                                    controller, alert_type, epoch_time)
 
                         # send the message to the handler
                         if send_message:
-                            self._send_json_msg(internal_json_msg)
+                            sent_events.setdefault(durable_id, []).append(
+                                self._send_json_msg(internal_json_msg))
 
                     # And set alert_type as fault
                     alert_type = self.rssencl.FRU_FAULT
                     self._previously_faulty_controllers[durable_id] = {
                         "health": controller_health, "alert_type": alert_type}
 
-                    internal_json_msg = self._create_internal_msg(controller, alert_type)
+                    internal_json_msg = self._create_internal_msg(controller, alert_type,
+                                                               epoch_time)
                     faulty_controller_messages.append(internal_json_msg)
 
                     state_changed = True
 
                     # send the message to the handler
                     if send_message:
-                        self._send_json_msg(internal_json_msg)
+                        sent_events.setdefault(durable_id, []).append(
+                            self._send_json_msg(internal_json_msg))
 
             # Check for healthy case
             elif controller_health == self.rssencl.HEALTH_OK:
@@ -272,52 +290,75 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
                         if previous_alert_type == self.rssencl.FRU_MISSING:
                             alert_type = self.rssencl.FRU_INSERTION
                         internal_json_msg = self._create_internal_msg(
-                            controller, alert_type)
+                            controller, alert_type, epoch_time)
                         faulty_controller_messages.append(internal_json_msg)
                         if send_message:
-                            self._send_json_msg(internal_json_msg)
+                            sent_events.setdefault(durable_id, []).append(
+                                self._send_json_msg(internal_json_msg))
                     del self._previously_faulty_controllers[durable_id]
                     state_changed = True
-            # Persist faulty Controller list to file only if something is changed
-            if state_changed:
-                # Wait till msg is sent to message bus or added in consul for resending.
-                # If timed out, do not update cache and revert in-memory cache.
-                # So, in next iteration change can be detected
-                if self._event.wait(self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT):
-                    store.put(self._previously_faulty_controllers,\
-                        self._faulty_controller_file_path)
-                else:
-                    self._previously_faulty_controllers = store.get(self._faulty_controller_file_path)
-                state_changed = False
             alert_type = ""
+        # Persist faulty Controller list to file only if something is changed.
+        # Done once per poll rather than once per changed controller.
+        if state_changed:
+            self._revert_unsent_controllers(sent_events)
+            self._persist_faulty_controllers()
         return faulty_controller_messages
 
-    def _create_internal_msg(self, controller_detail, alert_type):
+    def _revert_unsent_controllers(self, sent_events):
+        """Waits till msgs are sent to message bus or added in consul for
+           resending, for up to PERSISTENT_DATA_UPDATE_TIMEOUT per Controller.
+           If any msg of a Controller timed out, its entry in the in-memory
+           cache is reverted to the persisted one. So, in next iteration
+           its change can be detected.
+        """
+        for durable_id, events in sent_events.items():
+            deadline = time.monotonic() + \
+                self.rssencl.PERSISTENT_DATA_UPDATE_TIMEOUT
+            if all(event.wait(max(0, deadline - time.monotonic()))
+                    for event in events if event is not None):
+                continue
+            if durable_id in self._persisted_faulty_controllers:
+                self._previously_faulty_controllers[durable_id] = \
+                    copy.deepcopy(self._persisted_faulty_controllers[durable_id])
+            else:
+                self._previously_faulty_controllers.pop(durable_id, None)
+
+    def _persist_faulty_controllers(self):
+        """Writes faulty Controller data to the store, unless it is the
+           same as what was last written there.
+        """
+        if self._previously_faulty_controllers == self._persisted_faulty_controllers:
+            return
+        store.put(self._previously_faulty_controllers,\
+            self._faulty_controller_file_path)
+        self._persisted_faulty_controllers = \
+            copy.deepcopy(self._previously_faulty_controllers)
+
+    def _create_internal_msg(self, controller_detail, alert_type, epoch_time):
         """Forms a dictionary containing info about Controllers to send to
            message handler.
         """
         if not controller_detail:
             return {}
 
-        severity_reader = SeverityReader()
-        severity = severity_reader.map_severity(alert_type)
-        epoch_time = str(int(time.time()))
+        severity = self.severity_reader.map_severity(alert_type)
 
         alert_id = self._get_alert_id(epoch_time)
-        fru = self.rssencl.is_storage_fru('controller')
-        resource_id = controller_detail.get("durable-id", "")
-        host_name = self.os_utils.get_fqdn()
-        info = {
+        if self._info_template is None:
+            # Built on the first alert, once the FRU list is known
+            self._info_template = {
                 "resource_type": self.RESOURCE_TYPE,
-                "fru": fru,
-                "resource_id": resource_id,
-                "event_time": epoch_time
-                }
+                "fru": self.rssencl.is_storage_fru('controller')
+            }
+        info = self._info_template.copy()
+        info["resource_id"] = controller_detail.get("durable-id", "")
+        info["event_time"] = epoch_time
 
-        internal_json_msg = json.dumps(
+        internal_json_msg = json_utils.dumps(
             {"sensor_request_type": {
                 "enclosure_alert": {
-                    "host_id": host_name,
+                    "host_id": self.host_name,
                     "severity": severity,
                     "alert_id": alert_id,
                     "alert_type": alert_type,
@@ -333,16 +374,16 @@ class RealStorControllerSensor(SensorThread, InternalMsgQ):
         """Returns alert id which is a combination of
            epoch_time and salt value
         """
-        salt = str(uuid.uuid4().hex)
-        alert_id = epoch_time + salt
-        return alert_id
+        return f"{epoch_time}{os.urandom(16).hex()}"
 
     def _send_json_msg(self, json_msg):
-        """Sends JSON message to Handler"""
+        """Sends JSON message to Handler. Returns the event set once the
+           msg is sent to message bus or added in consul for resending."""
         if not json_msg:
-            return
-        self._event.clear()
-        self._write_internal_msgQ(RealStorEnclMsgHandler.name(), json_msg, self._event)
+            return None
+        event = Event()
+        self._write_internal_msgQ(RealStorEnclMsgHandler.name(), json_msg, event)
+        return event
 
     def suspend(self):
         """Suspends the module thread. It should be non-blocking"""
@@ -36,6 +36,7 @@ from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
 from framework.utils.os_utils import OSUtils
+from framework.utils import json_utils
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.Ilogicalvolume import ILogicalVolumesensor
@@ -250,7 +251,7 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
                      err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
         disk_groups = response_data.get("disk-groups")
         return disk_groups
 
@@ -274,7 +275,7 @@ class RealStorLogicalVolumeSensor(SensorThread, InternalMsgQ):
                  err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
         logical_volumes = response_data.get("volumes")
         return logical_volumes
 
@@ -32,6 +32,7 @@ from framework.utils.severity_reader import SeverityReader
 from framework.platforms.realstor.realstor_enclosure import singleton_realstorencl
 from framework.utils.store_factory import store
 from framework.utils.os_utils import OSUtils
+from framework.utils import json_utils
 
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
@@ -201,7 +202,7 @@ class RealStorEnclosureSensor(SensorThread, InternalMsgQ):
                                 failed with http err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
         enclosure_status = response_data["events"]
 
         return enclosure_status
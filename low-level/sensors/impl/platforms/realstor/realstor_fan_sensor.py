@@ -37,6 +37,7 @@ from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
 from framework.utils.os_utils import OSUtils
+from framework.utils import json_utils
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.Ifan import IFANsensor
@@ -239,7 +240,7 @@ class RealStorFanSensor(SensorThread, InternalMsgQ):
                                {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
 
         fan_modules_list = response_data["fan-modules"]
         return fan_modules_list
@@ -37,6 +37,7 @@ from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
 from framework.utils.os_utils import OSUtils
+from framework.utils import json_utils
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.Ipsu import IPSUsensor
@@ -180,7 +181,7 @@ class RealStorPSUSensor(SensorThread, InternalMsgQ):
                                        with err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
         psus = response_data.get("power-supplies")
         return psus
 
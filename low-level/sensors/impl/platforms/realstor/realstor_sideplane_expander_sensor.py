@@ -36,6 +36,7 @@ from framework.utils.service_logging import logger
 from framework.utils.severity_reader import SeverityReader
 from framework.utils.store_factory import store
 from framework.utils.os_utils import OSUtils
+from framework.utils import json_utils
 # Modules that receive messages from this module
 from message_handlers.real_stor_encl_msg_handler import RealStorEnclMsgHandler
 from sensors.ISideplane_expander import ISideplaneExpandersensor
@@ -171,7 +172,7 @@ class RealStorSideplaneExpanderSensor(SensorThread, InternalMsgQ):
                                       err {response.status_code}")
             return
 
-        response_data = json.loads(response.text)
+        response_data = json_utils.loads(response.content)
         encl_drawers = response_data["enclosures"][0]["drawers"]
         if encl_drawers:
             for drawer in encl_drawers:
@@ -37,7 +37,6 @@ def test_raid_integrity_sensor(args):
     sleep(10)
     while not world.sspl_modules[IngressProcessorTests.name()]._is_my_msgQ_empty():
         ingressMsg = world.sspl_modules[IngressProcessorTests.name()]._read_my_msgQ()
-        sleep(0.1)
         print("Received for raid_integrity_data: {0}".format(ingressMsg))
         try:
             # Make sure we get back the message type that matches the request
@@ -46,7 +45,6 @@ def test_raid_integrity_sensor(args):
                 raid_data_msg = msg_type
                 break
         except Exception as exception:
-            sleep(0.1)
             print(exception)
 
     assert(raid_data_msg is not None)
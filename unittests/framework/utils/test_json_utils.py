@@ -0,0 +1,60 @@
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import unittest
+from unittest.mock import patch
+
+from framework.utils import json_utils
+
+
+class TestJsonUtils(unittest.TestCase):
+    """Test json_utils with orjson, when installed, and with json module."""
+
+    DOC = {"controllers": [{"durable-id": "controller_a", "health": "OK"}]}
+    TEXT = '{"controllers": [{"durable-id": "controller_a", "health": "OK"}]}'
+
+    def _for_each_backend(self, test):
+        backends = [False, True] if json_utils.use_orjson else [False]
+        for use_orjson in backends:
+            with self.subTest(use_orjson=use_orjson), \
+                    patch.object(json_utils, 'use_orjson', use_orjson):
+                test()
+
+    def test_loads_str(self):
+        self._for_each_backend(
+            lambda: self.assertEqual(json_utils.loads(self.TEXT), self.DOC))
+
+    def test_loads_bytes(self):
+        self._for_each_backend(
+            lambda: self.assertEqual(
+                json_utils.loads(self.TEXT.encode()), self.DOC))
+
+    def test_loads_malformed(self):
+        def test():
+            for data in ['{"controllers": [', b'<html></html>', '']:
+                with self.assertRaises(ValueError):
+                    json_utils.loads(data)
+        self._for_each_backend(test)
+
+    def test_dumps(self):
+        def test():
+            out = json_utils.dumps(self.DOC)
+            self.assertIsInstance(out, str)
+            self.assertEqual(json_utils.loads(out), self.DOC)
+        self._for_each_backend(test)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# Copyright (c) 2021 Seagate Technology LLC and/or its Affiliates
+#
+# This program is free software: you can redistribute it and/or modify it under the
+# terms of the GNU Affero General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY
+# WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS FOR A
+# PARTICULAR PURPOSE. See the GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License along
+# with this program. If not, see <https://www.gnu.org/licenses/>. For any questions
+# about this software or licensing, please email opensource@seagate.com or
+# cortx-questions@seagate.com.
+
+import unittest
+
+from sensors.impl.generic.node_hw import (NodeHWsensor, SENSOR_ID_RE,
+                                         SDR_SENSOR_TYPE_RE)
+
+
+# 'ipmitool sensor get' output for several sensors
+SENSOR_GET_OUTPUT = """Locating sensor record...
+Sensor ID              : PS1 Status (0xc8)
+ Entity ID             : 10.1
+ Sensor Type (Discrete): Power Supply
+ States Asserted       : Power Supply
+                         [Presence detected]
+
+Sensor ID              : FAN1 (0x41)
+ Entity ID             : 29.1
+ Sensor Type (Threshold)  : Fan
+ Sensor Reading        : 4200 (+/- 0) RPM
+ Status                : ok
+
+Sensor ID              : HDD 0 Status
+ Entity ID             : 4.1
+ Sensor Type (Discrete): Drive Slot / Bay
+"""
+
+# 'ipmitool -v sdr elist all' output with a full threshold record,
+# a compact record, an event-only record and a FRU locator record
+SDR_ELIST_OUTPUT = """Sensor ID              : CPU Temp (0x1)
+ Entity ID             : 3.1 (Processor)
+ Sensor Type (Threshold)  : Temperature (0x01)
+ Sensor Reading        : 39 (+/- 0) degrees C
+ Status                : ok
+
+Sensor ID              : PS1 Status (0xc8)
+ Entity ID             : 10.1 (Power Supply)
+ Sensor Type (Discrete): Power Supply (0x08)
+ States Asserted       : Power Supply
+                         [Presence detected]
+
+Sensor ID              : PS Redundancy (0xcb)
+ Entity ID             : 19.1 (Power Unit)
+ Sensor Type            : Power Unit (0x09)
+
+Device ID              : Pwr Supply 1 FRU (0x1)
+ Entity ID             : 10.1 (Power Supply)
+"""
+
+
+class TestVerboseSdr(unittest.TestCase):
+    """Test parsing of verbose 'sdr elist' output per sensor type."""
+
+    def test_sdr_sensor_type_re(self):
+        for line, sensor_type in [
+                (" Sensor Type (Threshold)  : Temperature (0x01)", "Temperature"),
+                (" Sensor Type (Discrete): Drive Slot / Bay (0x0d)", "Drive Slot / Bay"),
+                (" Sensor Type            : Power Unit (0x09)", "Power Unit")]:
+            self.assertEqual(SDR_SENSOR_TYPE_RE.match(line).group(1), sensor_type)
+
+    def test_parse_verbose_sdr(self):
+        sensors = NodeHWsensor._parse_verbose_sdr(SDR_ELIST_OUTPUT)
+        self.assertDictEqual(sensors, {
+            "Temperature": [("CPU Temp", "01")],
+            "Power Supply": [("PS1 Status", "c8")],
+            "Power Unit": [("PS Redundancy", "cb")]})
+
+    def test_parse_verbose_sdr_error(self):
+        self.assertIsNone(NodeHWsensor._parse_verbose_sdr(
+            "Unable to open SDR for reading: command failed\n"))
+
+
+class TestSensorBlocks(unittest.TestCase):
+    """Test splitting of batched 'sensor get' output per sensor."""
+
+    def test_sensor_id_re(self):
+        match = SENSOR_ID_RE.match("Sensor ID              : HDD 0 Status (0xf0)")
+        self.assertEqual(match.group(1), "HDD 0 Status")
+        match = SENSOR_ID_RE.match("Sensor ID              : HDD 0 Status")
+        self.assertEqual(match.group(1), "HDD 0 Status")
+        self.assertIsNone(SENSOR_ID_RE.match(" Entity ID             : 4.1"))
+
+    def test_split_sensor_blocks(self):
+        blocks = NodeHWsensor._split_sensor_blocks(SENSOR_GET_OUTPUT)
+        self.assertListEqual(list(blocks), ["PS1 Status", "FAN1", "HDD 0 Status"])
+        self.assertListEqual(blocks["PS1 Status"], [
+            "Sensor ID              : PS1 Status (0xc8)",
+            " Entity ID             : 10.1",
+            " Sensor Type (Discrete): Power Supply",
+            " States Asserted       : Power Supply",
+            "                         [Presence detected]"])
+        # Blocks end at the blank line separating them
+        self.assertEqual(blocks["FAN1"][-1], " Status                : ok")
+        # The last block needs no trailing blank line
+        self.assertEqual(len(blocks["HDD 0 Status"]), 3)
+
+    def test_split_sensor_blocks_no_sensor(self):
+        self.assertDictEqual(
+            NodeHWsensor._split_sensor_blocks("Locating sensor record...\n"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()